@@ -2,20 +2,79 @@
 Clipboard monitoring module for detecting and processing clipboard changes for ClipNest.
 """
 
-import os
+import logging
 from datetime import datetime
 
-import pyperclip
-from PyQt6.QtCore import QObject, pyqtSignal
-from PyQt6.QtGui import QImage
+import xxhash
+from PyQt6.QtCore import (
+    QBuffer,
+    QIODevice,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+    pyqtSlot,
+)
+from PyQt6.QtGui import QClipboard, QImage, QImageWriter
 from PyQt6.QtWidgets import QApplication
 
+logger = logging.getLogger(__name__)
+
+
+# Clipboard changes closer together than this are processed once
+CHANGE_COALESCE_MS = 10
+
+# Encoded image formats other apps commonly put on the clipboard
+_ENCODED_IMAGE_FORMATS = ("image/png", "image/tiff", "image/bmp")
+
+
+def load_clipboard_image(database, content):
+    """Load a stored image item, from its blob or from a legacy file path."""
+    data = database.get_blob(content)
+    if data is not None:
+        return QImage.fromData(data, "PNG")
+    return QImage(content)
+
+
+class _ImageEncodeTask(QRunnable):
+    """Encode a clipboard image to PNG bytes on a worker thread."""
+
+    # zlib level 1: screenshots compress nearly as well as at the default 6.
+    # Set directly, not via setQuality(): Qt maps PNG quality inversely
+    # (quality 0 means zlib level 9) and ignores it once compression is set.
+    PNG_COMPRESSION = 1
+
+    def __init__(self, image, blob_key, timestamp, done_signal):
+        super().__init__()
+        # QImage is implicitly shared, so this holds a reference, not a copy
+        self.image = image
+        self.blob_key = blob_key
+        self.timestamp = timestamp
+        self.done_signal = done_signal
+
+    def run(self):
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        writer = QImageWriter(buffer, b"png")
+        writer.setCompression(self.PNG_COMPRESSION)
+        if not writer.write(self.image):
+            logger.error("Error encoding image: %s", writer.errorString())
+            return
+        # Queued back to the monitor's thread, which owns the database
+        self.done_signal.emit(self.blob_key, self.timestamp, bytes(buffer.data()))
+
 
 class ClipNestMonitor(QObject):
     """Monitor system clipboard for changes and store new items for ClipNest."""
 
-    # Signal emitted when a new item is added to clipboard
-    new_item_signal = pyqtSignal()
+    # Signal emitted with the stored row when a new item is added to clipboard
+    new_item_signal = pyqtSignal(object)  # sqlite3.Row of the stored item
+    # Emitted from the thread pool once an image has been encoded
+    _image_encoded = pyqtSignal(str, object, bytes)
+
+    # Bound once so the hot path skips the module attribute lookup
+    _hash_fn = staticmethod(xxhash.xxh3_128_intdigest)
 
     def __init__(self, database):
         super().__init__()
@@ -23,17 +82,34 @@ class ClipNestMonitor(QObject):
         self.monitoring = False
         self.last_clipboard_data = None
         self.clipboard = QApplication.instance().clipboard()
-        self.clipboard.dataChanged.connect(self._on_clipboard_change)
+        self.clipboard.changed.connect(self._on_clipboard_mode_changed)
+        # Editors often set the clipboard twice in a row; handle the burst once
+        self._change_timer = QTimer(self)
+        self._change_timer.setSingleShot(True)
+        self._change_timer.setInterval(CHANGE_COALESCE_MS)
+        self._change_timer.timeout.connect(self._on_clipboard_change)
         self._ignore_next_change = False  # Add this flag
+        self._last_encoded_image_key = None
+        self._last_clipboard_image_cache_key = None
+        self._last_clipboard_image_hash = None
+        self._image_encoded.connect(self._on_image_encoded)
 
     def start_monitoring(self):
         """Start monitoring clipboard changes."""
         # No thread needed, handled by Qt signal
-        print("Clipboard monitoring started (Qt events)")
+        logger.info("Clipboard monitoring started (Qt events)")
 
     def stop_monitoring(self):
         """Stop clipboard monitoring."""
-        print("Clipboard monitoring stopped")
+        logger.info("Clipboard monitoring stopped")
+
+    @pyqtSlot(QClipboard.Mode)
+    def _on_clipboard_mode_changed(self, mode):
+        """Schedule processing for changes to the main clipboard only."""
+        # X11 also reports PRIMARY selection changes, which are not copies
+        if mode != QClipboard.Mode.Clipboard:
+            return
+        self._change_timer.start()
 
     def _on_clipboard_change(self):
         """Handle clipboard data changes."""
@@ -46,23 +122,40 @@ class ClipNestMonitor(QObject):
             if hasattr(self, "_skip_next_image") and self._skip_next_image:
                 self._skip_next_image = False
                 return
+            # Probe the encoded payload first: decoding into a QImage is the
+            # expensive step, and is pointless for a re-announced image
+            encoded_key = self._encoded_image_key(md)
+            if encoded_key is not None and encoded_key == self._last_encoded_image_key:
+                return  # Ignore duplicate image
+            self._last_encoded_image_key = encoded_key
             image = self.clipboard.image()
             if not image.isNull():
-                # Check for duplicate by hash (compare with last_clipboard_data)
+                # cacheKey() only changes when the image data does: skip hashing
+                cache_key = image.cacheKey()
+                if cache_key == self._last_clipboard_image_cache_key:
+                    return  # Ignore duplicate image
+                self._last_clipboard_image_cache_key = cache_key
                 img_hash = self._hash_image(image)
-                if img_hash == getattr(self, "_last_clipboard_image_hash", None):
+                if img_hash == self._last_clipboard_image_hash:
                     return  # Ignore duplicate image
-                # Save image to file
-                img_dir = os.path.expanduser("~/.clipboard_manager/images")
-                os.makedirs(img_dir, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                img_path = os.path.join(img_dir, f"clipnest_{timestamp}.png")
-                image.save(img_path, "PNG")
-                self.database.add_item(
-                    content_type="image", content=img_path, timestamp=datetime.now()
-                )
                 self._last_clipboard_image_hash = img_hash
-                self.new_item_signal.emit()
+                # Images are stored once per content hash, inside the database
+                blob_key = f"{img_hash:032x}"
+                timestamp = datetime.now()
+                if self.database.has_blob(blob_key):
+                    item_id = self.database.add_item(
+                        content_type="image", content=blob_key, timestamp=timestamp
+                    )
+                    if item_id is not None:
+                        logger.debug("New clipboard image stored: %s", blob_key)
+                        self._emit_new_item(item_id)
+                else:
+                    # Encoding runs off the GUI thread; the row is added when done
+                    QThreadPool.globalInstance().start(
+                        _ImageEncodeTask(
+                            image, blob_key, timestamp, self._image_encoded
+                        )
+                    )
         elif md.hasText():
             if hasattr(self, "_skip_next_text") and self._skip_next_text:
                 self._skip_next_text = False
@@ -71,11 +164,29 @@ class ClipNestMonitor(QObject):
             if text and text.strip():
                 if text == getattr(self, "_last_clipboard_text", None):
                     return  # Ignore duplicate text
-                self.database.add_item(
+                item_id = self.database.add_item(
                     content_type="text", content=text, timestamp=datetime.now()
                 )
                 self._last_clipboard_text = text
-                self.new_item_signal.emit()
+                if item_id is not None:
+                    # %.50s truncates inside the formatter, only if DEBUG is on
+                    logger.debug("New clipboard item stored: %.50s", text)
+                    self._emit_new_item(item_id)
+
+    def _on_image_encoded(self, blob_key, timestamp, data):
+        """Store an image once its PNG encoding has finished."""
+        item_id = self.database.add_item(
+            content_type="image", content=blob_key, timestamp=timestamp, blob=data
+        )
+        if item_id is not None:
+            logger.debug("New clipboard image stored: %s", blob_key)
+            self._emit_new_item(item_id)
+
+    def _emit_new_item(self, item_id):
+        """Notify listeners of a stored item, passing its database row."""
+        row = self.database.get_item(item_id)
+        if row is not None:
+            self.new_item_signal.emit(row)
 
     def get_current_clipboard(self):
         """Get current clipboard content."""
@@ -92,7 +203,7 @@ class ClipNestMonitor(QObject):
         self._skip_next_image = True if content_type == "image" else False
         self._skip_next_text = True if content_type == "text" else False
         if content_type == "image":
-            image = QImage(content)
+            image = load_clipboard_image(self.database, content)
             if not image.isNull():
                 self.clipboard.setImage(image)
                 return True
@@ -101,9 +212,21 @@ class ClipNestMonitor(QObject):
             self.clipboard.setText(content)
             return True
 
-    def _hash_image(self, image):
-        # Convert QImage to bytes and hash
-        import hashlib
+    def _encoded_image_key(self, md):
+        """Identify the encoded image on offer without decoding it.
 
-        buffer = image.bits().asstring(image.sizeInBytes())
-        return hashlib.sha256(buffer).hexdigest()
+        Returns (format, size, hash) of the first known encoded format, or None.
+        The whole payload is hashed, since screenshots often share a prefix.
+        """
+        formats = md.formats()
+        for fmt in _ENCODED_IMAGE_FORMATS:
+            if fmt in formats:
+                data = md.data(fmt)
+                return fmt, data.size(), xxhash.xxh3_64_intdigest(data)
+        return None
+
+    def _hash_image(self, image):
+        """Return a 128-bit content hash of the image pixels (zero-copy)."""
+        ptr = image.constBits()
+        ptr.setsize(image.sizeInBytes())
+        return self._hash_fn(memoryview(ptr))
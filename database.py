@@ -4,9 +4,138 @@ Database module for persistent storage of ClipNest clipboard history.
 
 import os
 import sqlite3
+import time
 from datetime import datetime
 from typing import List, Optional, Tuple
 
+import xxhash
+
+# Timestamps are stored as integer milliseconds since the epoch
+sqlite3.register_adapter(datetime, lambda d: int(d.timestamp() * 1000))
+
+# Statements reused on every call; SQLite's statement cache keys on the text
+_SQL_INSERT_ITEM = """
+    INSERT INTO clipboard_items (content_type, content, timestamp, content_sha)
+    VALUES (?, ?, ?, ?)
+"""
+
+_SQL_IS_DUPLICATE = """
+    SELECT 1 FROM clipboard_items
+    WHERE content_sha = ?
+    AND timestamp > ?
+    LIMIT 1
+"""
+
+_SQL_INSERT_BLOB = "INSERT OR IGNORE INTO blobs (sha, data) VALUES (?, ?)"
+
+_SQL_HAS_BLOB = "SELECT 1 FROM blobs WHERE sha = ?"
+
+_SQL_GET_BLOB = "SELECT data FROM blobs WHERE sha = ?"
+
+_SQL_DELETE_ORPHAN_BLOBS = """
+    DELETE FROM blobs
+    WHERE sha NOT IN (
+        SELECT content FROM clipboard_items WHERE content_type = 'image'
+    )
+"""
+
+_SQL_ITEMS_SEQ = "SELECT seq FROM sqlite_sequence WHERE name = 'clipboard_items'"
+
+_SQL_TRIM_HISTORY = """
+    DELETE FROM clipboard_items
+    WHERE is_favorite = FALSE
+    AND id <= (
+        SELECT id FROM clipboard_items
+        WHERE is_favorite = FALSE
+        ORDER BY id DESC
+        LIMIT 1 OFFSET MAX(
+            ? - (SELECT COUNT(*) FROM clipboard_items WHERE is_favorite = TRUE),
+            0
+        )
+    )
+"""
+
+# Listed rows carry the first 200 characters of text items as their preview,
+# and get_content() reads the full text on demand. Image items keep their
+# content (a blob key, or a file path for legacy items) whole.
+#
+# Lists are ordered by (is_favorite, timestamp, id), newest first, and paged
+# with a keyset: each page starts below the sort key of the previous page's
+# last row, so later pages cost the same as the first (unlike OFFSET).
+_SQL_GET_HISTORY = """
+    SELECT id, content_type, timestamp, is_favorite,
+           CASE WHEN content_type = 'image' THEN content
+                ELSE substr(content, 1, 200) END AS preview,
+           strftime('%m/%d %H:%M', timestamp / 1000, 'unixepoch', 'localtime')
+               AS ts_short
+    FROM clipboard_items
+    WHERE (is_favorite, timestamp, id) < (?, ?, ?)
+    ORDER BY is_favorite DESC, timestamp DESC, id DESC
+    LIMIT ?
+"""
+
+# Sort key above every row, for fetching the first page
+_FIRST_PAGE = (2, 2**63 - 1, 2**63 - 1)
+
+_SQL_GET_ITEM = """
+    SELECT id, content_type, timestamp, is_favorite,
+           CASE WHEN content_type = 'image' THEN content
+                ELSE substr(content, 1, 200) END AS preview,
+           strftime('%m/%d %H:%M', timestamp / 1000, 'unixepoch', 'localtime')
+               AS ts_short
+    FROM clipboard_items
+    WHERE id = ?
+"""
+
+_SQL_SEARCH_ITEMS_FTS = """
+    SELECT i.id, i.content_type, i.timestamp, i.is_favorite,
+           CASE WHEN i.content_type = 'image' THEN i.content
+                ELSE substr(i.content, 1, 200) END AS preview,
+           strftime('%m/%d %H:%M', i.timestamp / 1000, 'unixepoch', 'localtime')
+               AS ts_short
+    FROM clipboard_fts f
+    JOIN clipboard_items i ON i.id = f.rowid
+    WHERE clipboard_fts MATCH ?
+    AND (i.is_favorite, i.timestamp, i.id) < (?, ?, ?)
+    ORDER BY i.is_favorite DESC, i.timestamp DESC, i.id DESC
+    LIMIT ?
+"""
+
+# Trigram tokens are 3 characters; shorter queries fall back to a LIKE scan
+# over the same (text) rows the index covers
+_FTS_MIN_QUERY_LENGTH = 3
+
+_SQL_SEARCH_ITEMS = """
+    SELECT id, content_type, timestamp, is_favorite,
+           CASE WHEN content_type = 'image' THEN content
+                ELSE substr(content, 1, 200) END AS preview,
+           strftime('%m/%d %H:%M', timestamp / 1000, 'unixepoch', 'localtime')
+               AS ts_short
+    FROM clipboard_items
+    WHERE content_type = 'text' AND content LIKE ?
+    AND (is_favorite, timestamp, id) < (?, ?, ?)
+    ORDER BY is_favorite DESC, timestamp DESC, id DESC
+    LIMIT ?
+"""
+
+_SQL_GET_CONTENT = "SELECT content FROM clipboard_items WHERE id = ?"
+
+_SQL_TOGGLE_FAVORITE = """
+    UPDATE clipboard_items
+    SET is_favorite = NOT is_favorite
+    WHERE id = ?
+"""
+
+_SQL_DELETE_ITEM = "DELETE FROM clipboard_items WHERE id = ?"
+
+_SQL_CLEAR_NON_FAVORITES = "DELETE FROM clipboard_items WHERE is_favorite = FALSE"
+
+_SQL_CLEAR_ALL = "DELETE FROM clipboard_items"
+
+_SQL_COUNT_ITEMS = """
+    SELECT COUNT(*), COALESCE(SUM(is_favorite = TRUE), 0) FROM clipboard_items
+"""
+
 
 class ClipNestDatabase:
     """Handle SQLite database operations for ClipNest clipboard history."""
@@ -22,7 +151,13 @@ class ClipNestDatabase:
 
         self.db_path = db_path
         self.connection = None
+        self._cur = None  # Shared cursor, reused by every query
+        self._fts_enabled = False
         self.history_limit = 200  # Default limit
+        self.trim_interval = 32  # Inserts between history-limit checks
+        # Start due, so the first insert of every session trims; otherwise
+        # sessions shorter than trim_interval would never enforce the limit
+        self._inserts_since_trim = self.trim_interval
 
         self._connect()
         self._create_tables()
@@ -32,6 +167,17 @@ class ClipNestDatabase:
         try:
             self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
             self.connection.row_factory = sqlite3.Row  # Enable column access by name
+            # WAL with relaxed sync: one cheap fsync per checkpoint, not per commit
+            self.connection.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA mmap_size=268435456;
+                PRAGMA cache_size=-65536;
+            """
+            )
+            self._cur = self.connection.cursor()
             print(f"Connected to database: {self.db_path}")
         except Exception as e:
             print(f"Error connecting to database: {e}")
@@ -48,14 +194,42 @@ class ClipNestDatabase:
                 CREATE TABLE IF NOT EXISTS clipboard_items (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     content_type TEXT NOT NULL,
-                    content TEXT NOT NULL,  -- For images, this is the file path
-                    timestamp DATETIME NOT NULL,
+                    content TEXT NOT NULL,  -- For images, the key into blobs
+                    timestamp INTEGER NOT NULL,  -- Milliseconds since the epoch
                     is_favorite BOOLEAN DEFAULT FALSE,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    content_sha BLOB  -- xxh3_128 of content, for de-duplication
+                )
+            """
+            )
+
+            # Encoded image data, stored once per content hash
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    sha TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
                 )
             """
             )
 
+            # Databases created before content_sha existed need the column added
+            cursor.execute("PRAGMA table_info(clipboard_items)")
+            columns = {row["name"] for row in cursor.fetchall()}
+            if "content_sha" not in columns:
+                cursor.execute(
+                    "ALTER TABLE clipboard_items ADD COLUMN content_sha BLOB"
+                )
+
+            # Older databases stored local-time ISO strings; convert them once
+            cursor.execute(
+                """
+                UPDATE clipboard_items
+                SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000
+                WHERE typeof(timestamp) = 'text'
+            """
+            )
+
             # Create index for faster queries
             cursor.execute(
                 """
@@ -63,6 +237,20 @@ class ClipNestDatabase:
                 ON clipboard_items(timestamp DESC)
             """
             )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_favorite_timestamp
+                ON clipboard_items(is_favorite, timestamp)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_content_sha
+                ON clipboard_items(content_sha, timestamp)
+            """
+            )
+
+            self._create_fts_index(cursor)
 
             self.connection.commit()
             print("Database tables created/verified")
@@ -71,123 +259,195 @@ class ClipNestDatabase:
             print(f"Error creating database tables: {e}")
             raise
 
-    def add_item(self, content_type: str, content: str, timestamp: datetime) -> bool:
-        """Add a new clipboard item to the database."""
+    def _create_fts_index(self, cursor: sqlite3.Cursor):
+        """Create the trigram full-text index over text items, if supported."""
         try:
-            # Check if this exact content already exists recently
-            if self._is_duplicate(content):
-                return False
-
-            cursor = self.connection.cursor()
             cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                ("clipboard_fts",),
+            )
+            exists = cursor.fetchone() is not None
+
+            # Trigram tokens let MATCH answer substring queries like LIKE '%q%'
+            cursor.executescript(
                 """
-                INSERT INTO clipboard_items (content_type, content, timestamp)
-                VALUES (?, ?, ?)
-            """,
-                (content_type, content, timestamp),
+                CREATE VIRTUAL TABLE IF NOT EXISTS clipboard_fts USING fts5(
+                    content,
+                    content='clipboard_items',
+                    content_rowid='id',
+                    tokenize='trigram'
+                );
+
+                -- Only text is indexed; image content is a blob key
+                CREATE TRIGGER IF NOT EXISTS clipboard_fts_insert
+                AFTER INSERT ON clipboard_items WHEN new.content_type = 'text'
+                BEGIN
+                    INSERT INTO clipboard_fts (rowid, content)
+                    VALUES (new.id, new.content);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS clipboard_fts_delete
+                AFTER DELETE ON clipboard_items WHEN old.content_type = 'text'
+                BEGIN
+                    INSERT INTO clipboard_fts (clipboard_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS clipboard_fts_update
+                AFTER UPDATE OF content ON clipboard_items
+                WHEN old.content_type = 'text'
+                BEGIN
+                    INSERT INTO clipboard_fts (clipboard_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                    INSERT INTO clipboard_fts (rowid, content)
+                    VALUES (new.id, new.content);
+                END;
+            """
             )
 
-            self.connection.commit()
+            if not exists:
+                # Index rows stored before the full-text table existed
+                cursor.execute(
+                    """
+                    INSERT INTO clipboard_fts (rowid, content)
+                    SELECT id, content FROM clipboard_items
+                    WHERE content_type = 'text'
+                """
+                )
 
-            # Enforce history limit
-            self._enforce_history_limit()
+            self._fts_enabled = True
+
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 or the trigram tokenizer (< 3.34)
+            print(f"Full-text search unavailable, using LIKE: {e}")
+
+    def add_item(
+        self,
+        content_type: str,
+        content: str,
+        timestamp: datetime,
+        blob: Optional[bytes] = None,
+    ) -> Optional[int]:
+        """Add a new clipboard item to the database.
+
+        For images, content is the blob key and blob the encoded image data,
+        stored in the same transaction unless a blob with that key exists.
+        Returns the new item's id, or None if it was not added.
+        """
+        try:
+            # Check if this exact content already exists recently
+            content_sha = xxhash.xxh3_128_digest(content.encode())
+            if self._is_duplicate(content_sha):
+                return None
+
+            # Insert and trim in one transaction so only one commit hits disk
+            with self.connection:
+                if blob is not None:
+                    self._cur.execute(_SQL_INSERT_BLOB, (content, blob))
+                self._cur.execute(
+                    _SQL_INSERT_ITEM, (content_type, content, timestamp, content_sha)
+                )
+                item_id = self._cur.lastrowid
 
-            return True
+                # Enforce history limit, amortized over several inserts
+                self._inserts_since_trim += 1
+                if self._inserts_since_trim >= self.trim_interval:
+                    self._enforce_history_limit()
+
+            return item_id
 
         except Exception as e:
             print(f"Error adding item to database: {e}")
-            return False
+            return None
 
-    def _is_duplicate(self, content: str, time_window_minutes: int = 1) -> bool:
-        """Check if content is a duplicate within the time window."""
+    def _is_duplicate(self, content_sha: bytes, time_window_minutes: int = 1) -> bool:
+        """Check if content with this hash was added within the time window."""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM clipboard_items 
-                WHERE content = ? 
-                AND datetime(timestamp) > datetime('now', '-{} minutes')
-            """.format(
-                    time_window_minutes
-                ),
-                (content,),
-            )
-
-            count = cursor.fetchone()[0]
-            return count > 0
+            since = int(time.time() * 1000) - time_window_minutes * 60_000
+            self._cur.execute(_SQL_IS_DUPLICATE, (content_sha, since))
+            return self._cur.fetchone() is not None
 
         except Exception as e:
             print(f"Error checking for duplicates: {e}")
             return False
 
     def _enforce_history_limit(self):
-        """Remove oldest items if history exceeds the limit."""
+        """Remove oldest items if history exceeds the limit.
+
+        Runs inside the caller's transaction; the caller commits.
+        """
         try:
-            cursor = self.connection.cursor()
+            self._inserts_since_trim = 0
 
-            # Count total items
-            cursor.execute("SELECT COUNT(*) FROM clipboard_items")
-            total_items = cursor.fetchone()[0]
+            # The highest id ever issued is an O(1) upper bound on the row count
+            self._cur.execute(_SQL_ITEMS_SEQ)
+            row = self._cur.fetchone()
+            if row is None or row[0] <= self.history_limit:
+                return
 
-            if total_items > self.history_limit:
-                # Delete oldest items (keeping favorites)
-                items_to_delete = total_items - self.history_limit
-                cursor.execute(
-                    """
-                    DELETE FROM clipboard_items 
-                    WHERE id IN (
-                        SELECT id FROM clipboard_items 
-                        WHERE is_favorite = FALSE 
-                        ORDER BY timestamp ASC 
-                        LIMIT ?
-                    )
-                """,
-                    (items_to_delete,),
-                )
+            # Delete oldest items (keeping favorites, which count toward the limit)
+            self._cur.execute(_SQL_TRIM_HISTORY, (self.history_limit,))
 
-                self.connection.commit()
-                print(f"Cleaned up {cursor.rowcount} old items")
+            if self._cur.rowcount > 0:
+                print(f"Cleaned up {self._cur.rowcount} old items")
+                self._cur.execute(_SQL_DELETE_ORPHAN_BLOBS)
 
         except Exception as e:
             print(f"Error enforcing history limit: {e}")
 
-    def get_history(self, limit: int = 50) -> List[Tuple]:
+    @staticmethod
+    def page_key(row) -> Tuple:
+        """Sort key of a listed row; pass it as `after` to get the next page."""
+        return row["is_favorite"], row["timestamp"], row["id"]
+
+    def get_history(
+        self, limit: int = 50, after: Optional[Tuple] = None
+    ) -> List[Tuple]:
         """Get clipboard history ordered by most recent first."""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                SELECT id, content_type, content, timestamp, is_favorite
-                FROM clipboard_items 
-                ORDER BY is_favorite DESC, timestamp DESC 
-                LIMIT ?
-            """,
-                (limit,),
-            )
-
-            return cursor.fetchall()
+            return self._cur.execute(
+                _SQL_GET_HISTORY, (*(after or _FIRST_PAGE), limit)
+            ).fetchmany(limit)
 
         except Exception as e:
             print(f"Error getting history: {e}")
             return []
 
-    def search_items(self, query: str, limit: int = 50) -> List[Tuple]:
+    def get_item(self, item_id: int) -> Optional[sqlite3.Row]:
+        """Get a single clipboard item by id."""
+        try:
+            return self._cur.execute(_SQL_GET_ITEM, (item_id,)).fetchone()
+
+        except Exception as e:
+            print(f"Error getting item: {e}")
+            return None
+
+    def get_content(self, item_id: int) -> Optional[str]:
+        """Get the full content of an item, or None if it no longer exists."""
+        try:
+            row = self._cur.execute(_SQL_GET_CONTENT, (item_id,)).fetchone()
+            return row["content"] if row else None
+
+        except Exception as e:
+            print(f"Error getting content: {e}")
+            return None
+
+    def search_items(
+        self, query: str, limit: int = 50, after: Optional[Tuple] = None
+    ) -> List[Tuple]:
         """Search clipboard items by content."""
         try:
-            cursor = self.connection.cursor()
-            search_pattern = f"%{query}%"
-            cursor.execute(
-                """
-                SELECT id, content_type, content, timestamp, is_favorite
-                FROM clipboard_items 
-                WHERE content LIKE ? 
-                ORDER BY is_favorite DESC, timestamp DESC 
-                LIMIT ?
-            """,
-                (search_pattern, limit),
-            )
+            if self._fts_enabled and len(query) >= _FTS_MIN_QUERY_LENGTH:
+                # Quote as an FTS5 string so the query is matched literally
+                fts_query = '"' + query.replace('"', '""') + '"'
+                return self._cur.execute(
+                    _SQL_SEARCH_ITEMS_FTS, (fts_query, *(after or _FIRST_PAGE), limit)
+                ).fetchmany(limit)
 
-            return cursor.fetchall()
+            search_pattern = f"%{query}%"
+            return self._cur.execute(
+                _SQL_SEARCH_ITEMS, (search_pattern, *(after or _FIRST_PAGE), limit)
+            ).fetchmany(limit)
 
         except Exception as e:
             print(f"Error searching items: {e}")
@@ -196,18 +456,10 @@ class ClipNestDatabase:
     def toggle_favorite(self, item_id: int) -> bool:
         """Toggle favorite status of an item."""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                """
-                UPDATE clipboard_items 
-                SET is_favorite = NOT is_favorite 
-                WHERE id = ?
-            """,
-                (item_id,),
-            )
+            self._cur.execute(_SQL_TOGGLE_FAVORITE, (item_id,))
 
             self.connection.commit()
-            return cursor.rowcount > 0
+            return self._cur.rowcount > 0
 
         except Exception as e:
             print(f"Error toggling favorite: {e}")
@@ -216,11 +468,12 @@ class ClipNestDatabase:
     def delete_item(self, item_id: int) -> bool:
         """Delete a specific item from history."""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM clipboard_items WHERE id = ?", (item_id,))
+            self._cur.execute(_SQL_DELETE_ITEM, (item_id,))
+            deleted = self._cur.rowcount > 0
+            self._cur.execute(_SQL_DELETE_ORPHAN_BLOBS)
 
             self.connection.commit()
-            return cursor.rowcount > 0
+            return deleted
 
         except Exception as e:
             print(f"Error deleting item: {e}")
@@ -229,33 +482,44 @@ class ClipNestDatabase:
     def clear_history(self, keep_favorites: bool = True) -> bool:
         """Clear clipboard history."""
         try:
-            cursor = self.connection.cursor()
-
             if keep_favorites:
-                cursor.execute("DELETE FROM clipboard_items WHERE is_favorite = FALSE")
+                self._cur.execute(_SQL_CLEAR_NON_FAVORITES)
             else:
-                cursor.execute("DELETE FROM clipboard_items")
+                self._cur.execute(_SQL_CLEAR_ALL)
+            cleared = self._cur.rowcount
+            self._cur.execute(_SQL_DELETE_ORPHAN_BLOBS)
 
             self.connection.commit()
-            print(f"Cleared {cursor.rowcount} items from history")
+            print(f"Cleared {cleared} items from history")
             return True
 
         except Exception as e:
             print(f"Error clearing history: {e}")
             return False
 
-    def get_stats(self) -> dict:
-        """Get database statistics."""
+    def has_blob(self, sha: str) -> bool:
+        """Check whether image data with this key is already stored."""
         try:
-            cursor = self.connection.cursor()
+            return self._cur.execute(_SQL_HAS_BLOB, (sha,)).fetchone() is not None
 
-            cursor.execute("SELECT COUNT(*) FROM clipboard_items")
-            total_items = cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error checking blob: {e}")
+            return False
 
-            cursor.execute(
-                "SELECT COUNT(*) FROM clipboard_items WHERE is_favorite = TRUE"
-            )
-            favorite_items = cursor.fetchone()[0]
+    def get_blob(self, sha: str) -> Optional[bytes]:
+        """Get stored image data by key, or None if there is none."""
+        try:
+            row = self._cur.execute(_SQL_GET_BLOB, (sha,)).fetchone()
+            return row["data"] if row else None
+
+        except Exception as e:
+            print(f"Error getting blob: {e}")
+            return None
+
+    def get_stats(self) -> dict:
+        """Get database statistics."""
+        try:
+            total_items, favorite_items = self._cur.execute(_SQL_COUNT_ITEMS).fetchone()
 
             return {
                 "total_items": total_items,
@@ -267,6 +531,29 @@ class ClipNestDatabase:
             print(f"Error getting stats: {e}")
             return {}
 
+    def get_history_and_stats(self, limit: int = 100) -> Tuple[List[Tuple], dict]:
+        """Get recent history and database statistics in one read transaction."""
+        try:
+            # One snapshot and lock acquisition for both statements
+            with self.connection:
+                self._cur.execute("BEGIN")
+                rows = self._cur.execute(
+                    _SQL_GET_HISTORY, (*_FIRST_PAGE, limit)
+                ).fetchmany(limit)
+                total_items, favorite_items = self._cur.execute(
+                    _SQL_COUNT_ITEMS
+                ).fetchone()
+
+            return rows, {
+                "total_items": total_items,
+                "favorite_items": favorite_items,
+                "history_limit": self.history_limit,
+            }
+
+        except Exception as e:
+            print(f"Error getting history and stats: {e}")
+            return [], {}
+
     def close(self):
         """Close database connection."""
         if self.connection:
@@ -0,0 +1,80 @@
+"""
+Background database worker for ClipNest.
+Runs UI queries on a dedicated thread with its own SQLite connection.
+"""
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from database import ClipNestDatabase
+
+
+class ClipNestDbWorker(QObject):
+    """Serves database requests from the thread it is moved to.
+
+    SQLite connections must not be shared between threads, so the worker
+    opens its own connection once its thread starts. WAL mode lets it read
+    while the clipboard monitor writes through the main connection.
+    Requests arrive as queued signals and are answered with the *_ready
+    signals below; the version argument is echoed back untouched so the
+    caller can key caches on it.
+    """
+
+    history_ready = pyqtSignal(int, list, dict)
+    search_ready = pyqtSignal(str, int, list)
+    page_ready = pyqtSignal(str, list)
+    stats_ready = pyqtSignal(int, dict)
+    favorite_toggled = pyqtSignal(int, bool)
+    history_cleared = pyqtSignal(bool)
+
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self.database = None
+
+    @pyqtSlot()
+    def open(self):
+        """Open the worker's connection; connect to QThread.started."""
+        self.database = ClipNestDatabase(self.db_path)
+
+    @pyqtSlot()
+    def close(self):
+        """Close the worker's connection; connect to QThread.finished."""
+        if self.database:
+            self.database.close()
+            self.database = None
+
+    @pyqtSlot(int, int)
+    def fetch_history(self, limit, version):
+        """Load the most recent items along with the item counts."""
+        rows, stats = self.database.get_history_and_stats(limit)
+        self.history_ready.emit(version, rows, stats)
+
+    @pyqtSlot(str, int, int)
+    def search(self, text, limit, version):
+        """Search items by content."""
+        self.search_ready.emit(text, version, self.database.search_items(text, limit))
+
+    @pyqtSlot(str, int, object)
+    def fetch_page(self, text, limit, last_row):
+        """Load the page of history, or of search results, after last_row."""
+        after = self.database.page_key(last_row)
+        if text:
+            rows = self.database.search_items(text, limit, after)
+        else:
+            rows = self.database.get_history(limit, after)
+        self.page_ready.emit(text, rows)
+
+    @pyqtSlot(int)
+    def fetch_stats(self, version):
+        """Count stored items."""
+        self.stats_ready.emit(version, self.database.get_stats())
+
+    @pyqtSlot(int)
+    def toggle_favorite(self, item_id):
+        """Toggle an item's favorite flag."""
+        self.favorite_toggled.emit(item_id, self.database.toggle_favorite(item_id))
+
+    @pyqtSlot(bool)
+    def clear_history(self, keep_favorites):
+        """Delete stored items, optionally keeping favorites."""
+        self.history_cleared.emit(self.database.clear_history(keep_favorites))
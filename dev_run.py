@@ -1,25 +1,86 @@
 import os
+import signal
 import subprocess
 import sys
+import threading
 import time
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+# Editors emit several events per save; restart once they settle
+DEBOUNCE_SECONDS = 0.3
+# How long the app gets to exit on SIGTERM before it is killed
+TERMINATE_TIMEOUT = 2.0
+
 
 class RestartHandler(FileSystemEventHandler):
     def __init__(self, run_args):
         self.run_args = run_args
         self.process = self.start_process()
+        self._pending_timer = None
+        self._stopping = False  # Set by shutdown(); no restarts after it
+        self._lock = threading.Lock()  # Guards _pending_timer and _stopping
+        # Serializes stop/start without blocking watchdog's event thread
+        self._restart_lock = threading.Lock()
 
     def start_process(self):
         return subprocess.Popen([sys.executable] + self.run_args)
 
-    def on_any_event(self, event):
-        if event.src_path.endswith(".py"):
-            print(f"Change detected in {event.src_path}, restarting...")
-            self.process.terminate()
+    def stop_process(self):
+        """Ask the app to exit, killing it if it does not exit in time."""
+        if self.process.poll() is not None:
+            return
+        self.process.send_signal(signal.SIGTERM)
+        deadline = time.monotonic() + TERMINATE_TIMEOUT
+        while self.process.poll() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if self.process.poll() is None:
+            self.process.kill()
             self.process.wait()
+
+    def shutdown(self):
+        """Stop the app, waiting for any restart in progress to finish."""
+        with self._lock:
+            self._stopping = True
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+                self._pending_timer = None
+        with self._restart_lock:
+            self.stop_process()
+
+    def _is_relevant(self, path):
+        # Editor swap/backup files (.main.py.swp, main.py~) fail these checks
+        if "__pycache__" in path.split(os.sep):
+            return False
+        return path.endswith(".py") and not os.path.basename(path).startswith(".")
+
+    def on_any_event(self, event):
+        if event.is_directory or not self._is_relevant(event.src_path):
+            return
+        print(f"Change detected in {event.src_path}")
+        with self._lock:
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            timer = threading.Timer(DEBOUNCE_SECONDS, self._do_restart)
+            timer.args = (timer,)
+            timer.daemon = True
+            self._pending_timer = timer
+            timer.start()
+
+    def _do_restart(self, timer):
+        with self._lock:
+            # A cancel can miss a timer that already fired; the newer one restarts
+            if timer is not self._pending_timer:
+                return
+            self._pending_timer = None
+        with self._restart_lock:
+            # shutdown() may have run while this timer waited for the lock
+            with self._lock:
+                if self._stopping:
+                    return
+            print("Restarting...")
+            self.stop_process()
             self.process = self.start_process()
 
 
@@ -34,5 +95,5 @@ if __name__ == "__main__":
             time.sleep(1)
     except KeyboardInterrupt:
         observer.stop()
-        event_handler.process.terminate()
+        event_handler.shutdown()
     observer.join()
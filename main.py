@@ -4,16 +4,33 @@ ClipNest for macOS - Simple Version
 Main application entry point and orchestration.
 """
 
+import logging
+import os
 import signal
 import sys
 
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QSocketNotifier, Qt, QThread, QTimer
 from PyQt6.QtWidgets import QApplication
 
 from clipboard_monitor import ClipNestMonitor
 from database import ClipNestDatabase
+from db_worker import ClipNestDbWorker
 from ui import ClipNestUI
 
+try:
+    from AppKit import NSUserDefaults
+except ImportError:
+    # PyObjC is only available (and only needed) on macOS
+    NSUserDefaults = None
+
+
+def _is_dark_mode():
+    """Return True if macOS is using the dark appearance."""
+    if NSUserDefaults is None:
+        return False
+    style = NSUserDefaults.standardUserDefaults().stringForKey_("AppleInterfaceStyle")
+    return (style or "") == "Dark"
+
 
 class ClipNestApp:
     """Main application class that coordinates all components for ClipNest."""
@@ -23,28 +40,51 @@ class ClipNestApp:
         self.app.setApplicationName("ClipNest")
         self.app.setQuitOnLastWindowClosed(False)  # Keep running in background
 
-        # Detect system appearance (macOS)
-        import subprocess
+        # Detect system appearance (macOS) once; the UI reuses it
+        self.is_dark = _is_dark_mode()
+        self.apply_theme(self.is_dark)
 
-        is_dark = False
-        try:
-            result = subprocess.run(
-                ["defaults", "read", "-g", "AppleInterfaceStyle"],
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0 and "Dark" in result.stdout:
-                is_dark = True
-        except Exception as e:
-            print(f"Could not detect system appearance: {e}")
+        # Initialize components
+        self.database = ClipNestDatabase()
+        self.monitor = ClipNestMonitor(self.database)
+
+        # UI queries run on their own thread and connection
+        self.db_thread = QThread()
+        self.db_worker = ClipNestDbWorker(self.database.db_path)
+        self.db_worker.moveToThread(self.db_thread)
+        self.db_thread.started.connect(self.db_worker.open)
+        self.db_thread.finished.connect(self.db_worker.close)
+        self.db_thread.start()
+
+        self.ui = ClipNestUI(self.database, self.db_worker, is_dark=self.is_dark)
+
+        # Connect signals
+        self.monitor.new_item_signal.connect(self.ui.prepend_item)
+        # Qt relays the system appearance change notification, so no polling
+        self.app.styleHints().colorSchemeChanged.connect(self._on_color_scheme_changed)
+
+        # Setup graceful shutdown
+        signal.signal(signal.SIGINT, self.signal_handler)
+        signal.signal(signal.SIGTERM, self.signal_handler)
 
-        # Apply theme stylesheet
+        # Wake the Qt event loop when a signal arrives so Python can handle it
+        self._signal_r, signal_w = os.pipe()
+        os.set_blocking(self._signal_r, False)
+        os.set_blocking(signal_w, False)
+        signal.set_wakeup_fd(signal_w)
+        self._signal_notifier = QSocketNotifier(
+            self._signal_r, QSocketNotifier.Type.Read
+        )
+        self._signal_notifier.activated.connect(self._drain_signal_pipe)
+
+    def apply_theme(self, is_dark):
+        """Apply the application stylesheet for the given appearance."""
         if is_dark:
             self.app.setStyleSheet(
                 """
                 QWidget { background-color: #232629; color: #f0f0f0; }
                 QLineEdit, QTextEdit { background-color: #2b2b2b; color: #f0f0f0; border: 1px solid #444; }
-                QListWidget, QListWidgetItem { background-color: #232629; color: #f0f0f0; }
+                QListView { background-color: #232629; color: #f0f0f0; }
                 QPushButton { background-color: #444; color: #f0f0f0; border: 1px solid #666; padding: 4px 12px; border-radius: 4px; }
                 QPushButton:hover { background-color: #555; }
                 QLabel { color: #f0f0f0; }
@@ -58,7 +98,7 @@ class ClipNestApp:
                 """
                 QWidget { background-color: #f6f6f6; color: #232629; }
                 QLineEdit, QTextEdit { background-color: #fff; color: #232629; border: 1px solid #bbb; }
-                QListWidget, QListWidgetItem { background-color: #f6f6f6; color: #232629; }
+                QListView { background-color: #f6f6f6; color: #232629; }
                 QPushButton { background-color: #e0e0e0; color: #232629; border: 1px solid #bbb; padding: 4px 12px; border-radius: 4px; }
                 QPushButton:hover { background-color: #d0d0d0; }
                 QLabel { color: #232629; }
@@ -68,22 +108,19 @@ class ClipNestApp:
                 """
             )
 
-        # Initialize components
-        self.database = ClipNestDatabase()
-        self.monitor = ClipNestMonitor(self.database)
-        self.ui = ClipNestUI(self.database, is_dark=is_dark)
+    def _on_color_scheme_changed(self, scheme):
+        """Re-theme the running app when the system appearance changes."""
+        self.is_dark = scheme == Qt.ColorScheme.Dark
+        self.apply_theme(self.is_dark)
+        self.ui.set_dark_mode(self.is_dark)
 
-        # Connect signals
-        self.monitor.new_item_signal.connect(self.ui.refresh_history)
-
-        # Setup graceful shutdown
-        signal.signal(signal.SIGINT, self.signal_handler)
-        signal.signal(signal.SIGTERM, self.signal_handler)
-
-        # Timer to handle Ctrl+C in Qt event loop
-        self.timer = QTimer()
-        self.timer.start(500)
-        self.timer.timeout.connect(lambda: None)
+    def _drain_signal_pipe(self):
+        """Empty the wakeup pipe; the Python handler runs on return to Python."""
+        try:
+            while os.read(self._signal_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
 
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
@@ -97,8 +134,9 @@ class ClipNestApp:
         # Start clipboard monitoring
         self.monitor.start_monitoring()
 
-        # Show the UI (initially hidden, accessed via menubar)
-        self.ui.setup_menubar()
+        # Show the UI (initially hidden, accessed via menubar); the tray is
+        # built from the first event loop pass so startup is not held up
+        QTimer.singleShot(0, self.ui.setup_menubar)
 
         # Run the application
         return self.app.exec()
@@ -107,12 +145,15 @@ class ClipNestApp:
         """Clean shutdown of all components."""
         print("Shutting down ClipNest...")
         self.monitor.stop_monitoring()
+        self.db_thread.quit()
+        self.db_thread.wait()
         self.database.close()
         self.app.quit()
 
 
 def main():
     """Main entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = ClipNestApp()
     try:
         sys.exit(app.run())
@@ -2,140 +2,434 @@
 User Interface module for ClipNest.
 """
 
-from datetime import datetime
-
-import pyperclip
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QAction, QColor, QFont, QIcon, QPainter, QPixmap
+import logging
+import os
+import sys
+
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QRect,
+    QRunnable,
+    QSize,
+    Qt,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import (
+    QAction,
+    QColor,
+    QFont,
+    QFontMetrics,
+    QIcon,
+    QImage,
+    QPainter,
+    QPixmap,
+    QPixmapCache,
+)
 from PyQt6.QtWidgets import (
     QApplication,
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMainWindow,
     QMenu,
     QMenuBar,
     QMessageBox,
     QPushButton,
     QSplitter,
+    QStyle,
+    QStyledItemDelegate,
     QSystemTrayIcon,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
+from clipboard_monitor import load_clipboard_image
+from database import ClipNestDatabase
+
+logger = logging.getLogger(__name__)
+
+# History card palettes (main text, info text, background, hover background),
+# keyed by is_dark
+_CARD_COLORS = {
+    True: (
+        QColor("#f0f0f0"),
+        QColor("#cccccc"),
+        QColor("#343434"),
+        QColor("#464646"),
+    ),
+    False: (
+        QColor("#232629"),
+        QColor("#555555"),
+        QColor("#ede6e6"),
+        QColor("#ffffff"),
+    ),
+}
+
+# Pieces of the timestamp/type line under each preview; favorites also get
+# the star, drawn on its own at the right edge of that line
+_INFO_SEPARATOR = " • "
+_FAVORITE_STAR = "⭐"
+
+# Robust icon path resolution for PyInstaller bundle
+if getattr(sys, "frozen", False):
+    # PyInstaller bundle: use _MEIPASS if available
+    _ICON_DIR = getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
+else:
+    _ICON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_TRAY_ICONS = {}  # is_dark -> QIcon, loaded on first use
+
+
+def _tray_icon(is_dark):
+    """Get the menubar icon for the given appearance, loading it once."""
+    icon = _TRAY_ICONS.get(is_dark)
+    if icon is None:
+        icon_name = "clip_app_icon_dark.png" if is_dark else "clip_app_icon_light.png"
+        icon_path = os.path.join(_ICON_DIR, icon_name)
+        icon = QIcon(icon_path)
+        if icon.isNull():
+            logger.warning(
+                "Failed to load tray icon '%s'. Check the file path and PNG validity.",
+                icon_path,
+            )
+            icon = QIcon.fromTheme("edit-paste")
+        _TRAY_ICONS[is_dark] = icon
+    return icon
+
+
+class ClipNestModel(QAbstractListModel):
+    """List model holding the clipboard history rows shown in the UI."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._ids = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item_data = self._rows[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return item_data
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item_data["preview"]
+        return None
+
+    def reset(self, rows):
+        """Replace all rows; sqlite3.Row objects are stored as they are."""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._ids = {row["id"] for row in self._rows}
+        self.endResetModel()
+
+    def contains(self, item_id):
+        return item_id in self._ids
+
+    def find_row(self, item_id):
+        """Position of the row with item_id, or -1 if it is not shown."""
+        if item_id in self._ids:
+            for position, item_data in enumerate(self._rows):
+                if item_data["id"] == item_id:
+                    return position
+        return -1
+
+    def is_favorite(self, position):
+        return self._rows[position]["is_favorite"]
+
+    def favorite_count(self):
+        """Number of favorites pinned at the top of the list."""
+        count = 0
+        while count < len(self._rows) and self._rows[count]["is_favorite"]:
+            count += 1
+        return count
+
+    def insert_row(self, position, row):
+        """Insert one row at position."""
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, row)
+        self._ids.add(row["id"])
+        self.endInsertRows()
+
+    def append_rows(self, rows):
+        """Add a page of rows at the end, skipping rows already shown."""
+        rows = [row for row in rows if row["id"] not in self._ids]
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self._ids.update(row["id"] for row in rows)
+        self.endInsertRows()
+
+    def truncate(self, limit):
+        """Drop rows beyond limit from the end of the list."""
+        if len(self._rows) <= limit:
+            return
+        self.beginRemoveRows(QModelIndex(), limit, len(self._rows) - 1)
+        for item_data in self._rows[limit:]:
+            self._ids.discard(item_data["id"])
+        del self._rows[limit:]
+        self.endRemoveRows()
+
+    def set_favorite(self, position, is_favorite):
+        """Update one row's favorite flag and move it to its place in the list.
+
+        Rows keep the history order (favorites first, then newest first), so
+        the favorites stay one block at the top and the last row's sort key
+        stays valid for paging. Returns the row's new position.
+        """
+        # Rows are read-only sqlite3.Row objects; copy the one being changed
+        item_data = dict(self._rows[position])
+        item_data["is_favorite"] = is_favorite
+        key = ClipNestDatabase.page_key(item_data)
+        target = sum(
+            1
+            for other, row in enumerate(self._rows)
+            if other != position and ClipNestDatabase.page_key(row) > key
+        )
+        if target != position:
+            # Qt's destination counts rows before the move
+            destination = target + 1 if target > position else target
+            self.beginMoveRows(
+                QModelIndex(), position, position, QModelIndex(), destination
+            )
+            del self._rows[position]
+            self._rows.insert(target, item_data)
+            self.endMoveRows()
+        else:
+            self._rows[position] = item_data
+        index = self.index(target)
+        self.dataChanged.emit(index, index)
+        return target
 
-class ClipNestItemWidget(QWidget):
-    """Custom widget for displaying clipboard items in the list."""
 
-    def __init__(self, item_data, is_dark=True):
-        super().__init__()
-        self.item_data = item_data
-        self.is_dark = is_dark
-        self.setup_ui()
+class _ThumbnailTask(QRunnable):
+    """Decode and scale an image item's thumbnail on a worker thread."""
 
-    def setup_ui(self):
-        """Setup the item widget UI."""
-        # Card container layout
-        card_layout = QVBoxLayout()
-        card_layout.setContentsMargins(16, 4, 16, 4)  # Add spacing left/right
-        card_layout.setSpacing(0)
-
-        # Card widget for background (no border)
-        card_widget = QWidget()
-        card_widget_layout = QVBoxLayout()
-        card_widget_layout.setContentsMargins(12, 8, 12, 8)
-        card_widget_layout.setSpacing(4)
-
-        # Content preview (first 100 characters)
-        content_type = self.item_data.get("content_type", "text")
-        if content_type == "image":
-            # Show image thumbnail
-            pixmap = QPixmap(self.item_data["content"])
-            img_label = QLabel()
-            img_label.setPixmap(
-                pixmap.scaled(
-                    120,
-                    120,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-            )
-            card_widget_layout.addWidget(img_label)
-            preview = "[Image] " + self.item_data["content"]
-        else:
-            # Text content
-            content = self.item_data["content"]
-            preview = content[:100] + "..." if len(content) > 100 else content
-
-        # Choose text colors and background based on theme
-        if self.is_dark:
-            main_color = "#f0f0f0"
-            info_color = "#cccccc"
-            bg_color = "#343434"
-            hover_bg_color = "#464646"
-            border = "none"
+    def __init__(self, content, data, size, done_signal):
+        super().__init__()
+        self.content = content
+        self.data = data
+        self.size = size
+        self.done_signal = done_signal
+
+    def run(self):
+        if self.data is not None:
+            image = QImage.fromData(self.data, "PNG")
         else:
-            main_color = "#232629"
-            info_color = "#555555"
-            bg_color = "#ede6e6"
-            hover_bg_color = "#ffffff"
-            border = "none"
-
-        # Content label
-        content_label = QLabel(preview)
-        content_label.setWordWrap(True)
-        content_label.setTextFormat(Qt.TextFormat.PlainText)
-        content_label.setStyleSheet(
-            f"QLabel {{ color: {main_color} !important; font-size: 13px; background: transparent; }}"
-        )
+            image = QImage(self.content)  # Legacy items store a file path
+        if not image.isNull():
+            image = image.scaled(
+                self.size,
+                self.size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        # Queued back to the GUI thread, where pixmaps can be created
+        self.done_signal.emit(self.content, image)
 
-        # Info label (timestamp, type, favorite)
-        from datetime import datetime
 
-        timestamp = datetime.fromisoformat(self.item_data["timestamp"]).strftime(
-            "%m/%d %H:%M"
+class ClipNestDelegate(QStyledItemDelegate):
+    """Paints history rows as cards directly, without per-row widgets."""
+
+    # Card margins inside the row, and text padding inside the card
+    CARD_MARGINS = (16, 4, 16, 4)
+    CARD_PADDING = (12, 8, 12, 8)
+    LINE_SPACING = 4
+    # Gap between an image row's thumbnail and its text
+    THUMBNAIL_SPACING = 8
+
+    # Emitted once a thumbnail has been decoded and the view should repaint
+    thumbnail_loaded = pyqtSignal()
+    # Emitted from the thread pool with (content, scaled QImage)
+    _thumbnail_decoded = pyqtSignal(str, QImage)
+
+    def __init__(self, database, is_dark=True, parent=None):
+        super().__init__(parent)
+        self.database = database
+        self._pending_thumbnails = set()  # Image items being decoded
+        self._thumbnail_decoded.connect(self._on_thumbnail_decoded)
+
+        self.content_font = QFont()
+        self.content_font.setPixelSize(13)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(10)
+        self.content_metrics = QFontMetrics(self.content_font)
+        self.info_metrics = QFontMetrics(self.info_font)
+        # Every row has the same height, so thumbnails fit beside the text
+        self.thumbnail_size = (
+            self.content_metrics.height()
+            + self.LINE_SPACING
+            + self.info_metrics.height()
+        )
+        self.row_height = (
+            self.CARD_MARGINS[1]
+            + self.CARD_PADDING[1]
+            + self.thumbnail_size
+            + self.CARD_PADDING[3]
+            + self.CARD_MARGINS[3]
+        )
+        self.set_dark_mode(is_dark)
+
+    def set_dark_mode(self, is_dark):
+        """Choose text colors and background based on theme."""
+        self.is_dark = is_dark
+        (
+            self.main_color,
+            self.info_color,
+            self.bg_color,
+            self.hover_bg_color,
+        ) = _CARD_COLORS[is_dark]
+
+    def _thumbnail(self, content):
+        """Get the thumbnail for an image item, or None while it is decoded."""
+        pixmap = QPixmapCache.find(f"clipnest-thumb:{content}")
+        if pixmap is None and content not in self._pending_thumbnails:
+            self._pending_thumbnails.add(content)
+            # The blob lookup is a primary-key read; decoding runs off the GUI thread
+            QThreadPool.globalInstance().start(
+                _ThumbnailTask(
+                    content,
+                    self.database.get_blob(content),
+                    self.thumbnail_size,
+                    self._thumbnail_decoded,
+                )
+            )
+        return pixmap
+
+    def _on_thumbnail_decoded(self, content, image):
+        """Cache a decoded thumbnail and repaint the rows showing it."""
+        self._pending_thumbnails.discard(content)
+        QPixmapCache.insert(f"clipnest-thumb:{content}", QPixmap.fromImage(image))
+        self.thumbnail_loaded.emit()
+
+    def paint(self, painter, option, index):
+        item_data = index.data(Qt.ItemDataRole.UserRole)
+        card = option.rect.adjusted(
+            self.CARD_MARGINS[0],
+            self.CARD_MARGINS[1],
+            -self.CARD_MARGINS[2],
+            -self.CARD_MARGINS[3],
         )
-        info_text = f"{timestamp} • {self.item_data['content_type']}"
-        if self.item_data["is_favorite"]:
-            info_text += " • ⭐"
-        info_label = QLabel(info_text)
-        info_label.setStyleSheet(
-            f"QLabel {{ color: {info_color} !important; font-size: 10px; background: transparent; }}"
+        inner = card.adjusted(
+            self.CARD_PADDING[0],
+            self.CARD_PADDING[1],
+            -self.CARD_PADDING[2],
+            -self.CARD_PADDING[3],
         )
 
-        card_widget_layout.addWidget(content_label)
-        card_widget_layout.addWidget(info_label)
-        card_widget.setLayout(card_widget_layout)
-        card_widget.setStyleSheet(
-            f"""    
-            QWidget {{
-            background: {bg_color};
-            border: {border};
-            border-radius: 10px;
-            cursor: pointer;
-            }}
-            QWidget:hover {{
-            background: {hover_bg_color};
-            }}
-            """
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setBrush(self.hover_bg_color)
+        else:
+            painter.setBrush(self.bg_color)
+        painter.drawRoundedRect(card, 10, 10)
+
+        y = inner.top()
+        if item_data["content_type"] == "image":
+            pixmap = self._thumbnail(item_data["preview"])
+            if pixmap is not None:
+                painter.drawPixmap(inner.left(), y, pixmap)
+            inner.setLeft(inner.left() + self.thumbnail_size + self.THUMBNAIL_SPACING)
+            preview = "[Image]"
+        else:
+            # Line breaks and indentation collapse so the preview stays one line
+            preview = " ".join(item_data["preview"].split())
+
+        content_height = self.content_metrics.height()
+        painter.setFont(self.content_font)
+        painter.setPen(self.main_color)
+        painter.drawText(
+            QRect(inner.left(), y, inner.width(), content_height),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            self.content_metrics.elidedText(
+                preview, Qt.TextElideMode.ElideRight, inner.width()
+            ),
+        )
+        y += content_height + self.LINE_SPACING
+
+        painter.setFont(self.info_font)
+        painter.setPen(self.info_color)
+        info_rect = QRect(inner.left(), y, inner.width(), self.info_metrics.height())
+        painter.drawText(
+            info_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            item_data["ts_short"] + _INFO_SEPARATOR + item_data["content_type"],
         )
+        if item_data["is_favorite"]:
+            painter.drawText(
+                info_rect,
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                _FAVORITE_STAR,
+            )
+        painter.restore()
 
-        card_layout.addWidget(card_widget)
-        self.setLayout(card_layout)
-        self.setStyleSheet("background: transparent;")
+    def sizeHint(self, option, index):
+        # Constant, so the view can measure one row and skip the rest
+        return QSize(option.rect.width(), self.row_height)
 
 
 class ClipNestUI(QMainWindow):
     """Main UI window for ClipNest."""
 
-    def __init__(self, database, is_dark=True):
+    # Number of items loaded per page of history or search results
+    PAGE_SIZE = 50
+    # The next page loads once a row this close to the end is on screen
+    PAGE_PREFETCH_ROWS = 10
+    # Typing pause before a search runs, in milliseconds
+    SEARCH_DEBOUNCE_MS = 150
+    # Number of (query, data version) search results kept
+    SEARCH_CACHE_SIZE = 64
+
+    # Requests to the database worker, delivered on its thread
+    history_requested = pyqtSignal(int, int)
+    search_requested = pyqtSignal(str, int, int)
+    page_requested = pyqtSignal(str, int, object)
+    stats_requested = pyqtSignal(int)
+    favorite_toggle_requested = pyqtSignal(int)
+    clear_requested = pyqtSignal(bool)
+
+    def __init__(self, database, db_worker, is_dark=True):
         super().__init__()
+        # Used here only to load image blobs; queries go through db_worker
         self.database = database
         self.tray_icon = None
         self.is_dark = is_dark
+        # Bumped on every change to stored items; part of the search cache key
+        self._data_version = 0
+        self._search_cache = {}  # (query, data version) -> rows, oldest first
+        # (data version, stats); every change the UI makes or is told about
+        # bumps the version, which marks the cached counts dirty
+        self._stats_cache = None
+        self._stats_pending = False  # A count is running on the worker
+        self._history_stale = False  # Items arrived while the window was hidden
+        self._shown_query = ""  # Query the list shows results for; "" is history
+        self._more_rows = False  # Whether the last page loaded was a full one
+        self._page_pending = False
+
+        self.history_requested.connect(db_worker.fetch_history)
+        self.search_requested.connect(db_worker.search)
+        self.page_requested.connect(db_worker.fetch_page)
+        self.stats_requested.connect(db_worker.fetch_stats)
+        self.favorite_toggle_requested.connect(db_worker.toggle_favorite)
+        self.clear_requested.connect(db_worker.clear_history)
+        db_worker.history_ready.connect(self._on_history_ready)
+        db_worker.search_ready.connect(self._on_search_ready)
+        db_worker.page_ready.connect(self._on_page_ready)
+        db_worker.stats_ready.connect(self._on_stats_counted)
+        db_worker.favorite_toggled.connect(self._on_favorite_toggled)
+        db_worker.history_cleared.connect(self._on_history_cleared)
+
         self.setup_ui()
         self.setup_shortcuts()
 
@@ -157,26 +451,36 @@ class ClipNestUI(QMainWindow):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search clipboard history...")
         self.search_input.textChanged.connect(self.on_search_changed)
+        # Only the last keystroke of a burst runs the query
+        self._pending_query = ""
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.timeout.connect(self._do_search)
         search_layout.addWidget(QLabel("Search:"))
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
 
-        # History list
-        self.history_list = QListWidget()
-        self.history_list.itemClicked.connect(self.on_item_clicked)
-        self.history_list.itemDoubleClicked.connect(self.on_item_double_clicked)
-        self.history_list.setStyleSheet(
-            """
-            QListWidget::item:selected {
-                background: transparent;
-                color: #232629;
-                border-radius: 10px;
-            }
-            QListWidget::item:focus {
-                outline: none;
-            }
-            """
+        # History list: rows are painted by the delegate, not per-row widgets
+        self.model = ClipNestModel(self)
+        self.history_list = QListView()
+        self.history_list.setModel(self.model)
+        self.history_list.setViewMode(QListView.ViewMode.ListMode)
+        # Lay rows out in batches between events so big resets never stall
+        self.history_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.history_list.setBatchSize(20)
+        self.history_list.setUniformItemSizes(True)
+        delegate = ClipNestDelegate(self.database, is_dark=self.is_dark, parent=self)
+        delegate.thumbnail_loaded.connect(self.history_list.viewport().update)
+        self.history_list.setItemDelegate(delegate)
+        self.history_list.verticalScrollBar().valueChanged.connect(
+            self._on_list_scrolled
         )
+        # A double-click's first release already emits clicked, so copying
+        # again on doubleClicked would only repeat the copy
+        self.history_list.clicked.connect(self.on_item_clicked)
+        self.history_list.setStyleSheet("QListView { outline: none; }")
+        # Hover is painted by the delegate; tracking delivers State_MouseOver
+        self.history_list.setMouseTracking(True)
         layout.addWidget(self.history_list)
 
         # Button layout
@@ -201,6 +505,11 @@ class ClipNestUI(QMainWindow):
         # Status bar
         self.status_label = QLabel("Ready")
         layout.addWidget(self.status_label)
+        self._status_reset_timer = QTimer(self)
+        self._status_reset_timer.setSingleShot(True)
+        self._status_reset_timer.timeout.connect(
+            lambda: self.status_label.setText("Ready")
+        )
 
         # Load initial history
         self.refresh_history()
@@ -224,35 +533,7 @@ class ClipNestUI(QMainWindow):
         # Create tray icon
         self.tray_icon = QSystemTrayIcon(self)
 
-        # Robust icon path resolution for PyInstaller bundle
-        import os
-        import subprocess
-        import sys
-
-        if getattr(sys, "frozen", False):
-            # PyInstaller bundle: use _MEIPASS if available
-            icon_dir = getattr(sys, "_MEIPASS", os.path.dirname(sys.executable))
-        else:
-            icon_dir = os.path.dirname(os.path.abspath(__file__))
-        light_icon_path = os.path.join(icon_dir, "clip_app_icon_light.png")
-        dark_icon_path = os.path.join(icon_dir, "clip_app_icon_dark.png")
-        icon_path = light_icon_path
-        try:
-            result = subprocess.run(
-                ["defaults", "read", "-g", "AppleInterfaceStyle"],
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0 and "Dark" in result.stdout:
-                icon_path = dark_icon_path
-        except Exception as e:
-            print(f"Could not detect system appearance: {e}")
-        icon = QIcon(icon_path)
-        if icon.isNull():
-            print(
-                f"Warning: Failed to load tray icon '{icon_path}'. Check the file path and PNG validity."
-            )
-        self.tray_icon.setIcon(icon)
+        self.tray_icon.setIcon(_tray_icon(self.is_dark))
         self.tray_icon.setToolTip("ClipNest")
 
         # Create tray menu
@@ -272,6 +553,14 @@ class ClipNestUI(QMainWindow):
         self.tray_icon.activated.connect(self.on_tray_activated)
         self.tray_icon.show()
 
+    def set_dark_mode(self, is_dark):
+        """Switch the window and tray icon to the given appearance."""
+        self.is_dark = is_dark
+        self.history_list.itemDelegate().set_dark_mode(is_dark)
+        self.history_list.viewport().update()
+        if self.tray_icon is not None:
+            self.tray_icon.setIcon(_tray_icon(self.is_dark))
+
     def on_tray_activated(self, reason):
         """Handle tray icon activation."""
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -288,140 +577,217 @@ class ClipNestUI(QMainWindow):
         QApplication.instance().quit()
 
     def refresh_history(self):
-        """Refresh the history list from database."""
+        """Reload the whole history list from database."""
+        self.history_requested.emit(self.PAGE_SIZE, self._data_version)
+
+    def _on_history_ready(self, version, history, stats):
+        """Show history and stats loaded by the database worker."""
         try:
-            self.history_list.clear()
-
-            # Get history from database
-            history = self.database.get_history(100)
-
-            for row in history:
-                item_data = {
-                    "id": row["id"],
-                    "content_type": row["content_type"],
-                    "content": row["content"],
-                    "timestamp": row["timestamp"],
-                    "is_favorite": row["is_favorite"],
-                }
-
-                # Create list item
-                list_item = QListWidgetItem()
-
-                # Create custom widget with theme info
-                item_widget = ClipNestItemWidget(item_data, is_dark=self.is_dark)
-
-                # Set the widget and store data
-                list_item.setSizeHint(item_widget.sizeHint())
-                list_item.setData(Qt.ItemDataRole.UserRole, item_data)
-
-                self.history_list.addItem(list_item)
-                self.history_list.setItemWidget(list_item, item_widget)
-
-            # Update status
-            stats = self.database.get_stats()
-            self.status_label.setText(
-                f"Total items: {stats.get('total_items', 0)} | "
-                f"Favorites: {stats.get('favorite_items', 0)}"
-            )
+            self._show_first_page("", history)
+
+            self._on_stats_ready(version, stats)
 
         except Exception as e:
-            print(f"Error refreshing history: {e}")
+            logger.exception("Error refreshing history")
             self.status_label.setText(f"Error: {e}")
 
+    def prepend_item(self, row):
+        """Show a newly stored clipboard item without reloading the list."""
+        self._data_version += 1
+
+        # A hidden window has nothing to repaint; catch up once it is shown
+        if not self.isVisible():
+            self._history_stale = True
+            return
+
+        # Search results are a filtered view; they are reloaded when it ends
+        if self.search_input.text().strip() or self.model.contains(row["id"]):
+            return
+
+        try:
+            # New items go first, below the favorites pinned at the top. The
+            # row count is kept, so the next page still follows the last row.
+            limit = max(self.model.rowCount(), self.PAGE_SIZE)
+            self.model.insert_row(self.model.favorite_count(), row)
+            if self.model.rowCount() > limit:
+                self.model.truncate(limit)
+                self._more_rows = True
+
+            self._update_stats()
+
+        except Exception:
+            logger.exception("Error adding item")
+
+    def _update_stats(self):
+        """Show item counts, counting again only if items changed."""
+        if self._stats_cache is not None:
+            version, stats = self._stats_cache
+            if version == self._data_version:
+                self._show_stats(stats)
+                return
+        # A burst of new items waits for the running count, then counts once
+        if not self._stats_pending:
+            self._stats_pending = True
+            self.stats_requested.emit(self._data_version)
+
+    def _on_stats_counted(self, version, stats):
+        """Handle a count requested by _update_stats()."""
+        self._stats_pending = False
+        self._on_stats_ready(version, stats)
+        if version != self._data_version and self.isVisible() and not self._shown_query:
+            self._update_stats()
+
+    def _on_stats_ready(self, version, stats):
+        """Cache and show stats counted by the database worker."""
+        self._stats_cache = (version, stats)
+        self._show_stats(stats)
+
+    def _show_stats(self, stats):
+        """Show item counts in the status label."""
+        self.status_label.setText(
+            f"Total items: {stats.get('total_items', 0)} | "
+            f"Favorites: {stats.get('favorite_items', 0)}"
+        )
+
     def on_search_changed(self, text):
-        """Handle search input changes."""
+        """Handle search input changes, once typing pauses."""
+        self._pending_query = text
+        self._search_timer.start(self.SEARCH_DEBOUNCE_MS)
+
+    def _do_search(self):
+        """Run the search for the latest query text."""
+        text = self._pending_query
         if not text.strip():
             self.refresh_history()
             return
 
+        results = self._search_cache.get((text, self._data_version))
+        if results is None:
+            self.search_requested.emit(text, self.PAGE_SIZE, self._data_version)
+        else:
+            self._show_search_results(text, results)
+
+    def _on_search_ready(self, text, version, results):
+        """Cache search results and show them if the query is still current."""
+        self._search_cache[(text, version)] = results
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            del self._search_cache[next(iter(self._search_cache))]
+        if text == self._pending_query and self.search_input.text().strip():
+            self._show_search_results(text, results)
+
+    def _show_search_results(self, text, results):
+        """Fill the list with search results."""
         try:
-            self.history_list.clear()
-
-            # Search in database
-            results = self.database.search_items(text, 50)
+            self._show_first_page(text, results)
 
-            for row in results:
-                item_data = {
-                    "id": row["id"],
-                    "content_type": row["content_type"],
-                    "content": row["content"],
-                    "timestamp": row["timestamp"],
-                    "is_favorite": row["is_favorite"],
-                }
-
-                # Create list item
-                list_item = QListWidgetItem()
+            self.status_label.setText(f"Found {len(results)} items")
 
-                # Create custom widget with theme info
-                item_widget = ClipNestItemWidget(item_data, is_dark=self.is_dark)
+        except Exception:
+            logger.exception("Error searching")
 
-                # Set the widget and store data
-                list_item.setSizeHint(item_widget.sizeHint())
-                list_item.setData(Qt.ItemDataRole.UserRole, item_data)
+    def _show_first_page(self, text, rows):
+        """Replace the list with the first page of history or search results."""
+        self._shown_query = text
+        self._more_rows = len(rows) == self.PAGE_SIZE
+        self._page_pending = False
+        # The reset and the relayout it triggers reach the screen as one paint
+        self.history_list.setUpdatesEnabled(False)
+        try:
+            self.model.reset(rows)
+        finally:
+            self.history_list.setUpdatesEnabled(True)
 
-                self.history_list.addItem(list_item)
-                self.history_list.setItemWidget(list_item, item_widget)
+    def _on_list_scrolled(self, value):
+        """Load the next page once the last rows of the list are on screen."""
+        if not self._more_rows or self._page_pending or not self.model.rowCount():
+            return
+        # Checked by row, not scroll range, which grows during batched layout.
+        # Rows that are not laid out yet have no rect.
+        prefetch_row = max(self.model.rowCount() - self.PAGE_PREFETCH_ROWS, 0)
+        rect = self.history_list.visualRect(self.model.index(prefetch_row))
+        if not rect.isValid() or rect.top() >= self.history_list.viewport().height():
+            return
+        self._page_pending = True
+        last_row = self.model.index(self.model.rowCount() - 1).data(
+            Qt.ItemDataRole.UserRole
+        )
+        self.page_requested.emit(self._shown_query, self.PAGE_SIZE, last_row)
 
-            self.status_label.setText(f"Found {len(results)} items")
+    def _on_page_ready(self, text, rows):
+        """Append a page loaded by the database worker."""
+        # A page for a list that has since been replaced is dropped
+        if not self._page_pending or text != self._shown_query:
+            return
+        self._page_pending = False
+        self._more_rows = len(rows) == self.PAGE_SIZE
+        self.model.append_rows(rows)
 
-        except Exception as e:
-            print(f"Error searching: {e}")
+    def _flash_status(self, text):
+        """Show a status message, then reset to "Ready" after 2 seconds."""
+        self.status_label.setText(text)
+        # Restarting one timer gives the latest message its full 2 seconds
+        self._status_reset_timer.start(2000)
 
-    def on_item_clicked(self, item):
+    def on_item_clicked(self, index):
         """Handle single click on history item - copy to clipboard."""
         try:
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            content = item_data["content"]
-            content_type = item_data.get("content_type", "text")
-            from PyQt6.QtGui import QImage
-            from PyQt6.QtWidgets import QApplication
-
-            clipboard = QApplication.instance().clipboard()
+            item_data = index.data(Qt.ItemDataRole.UserRole)
+            # The model only holds a preview; read the full content now
+            content = self.database.get_content(item_data["id"])
+            content_type = item_data["content_type"]
+            if content is None:
+                self.status_label.setText("Item no longer exists.")
+                return
+
+            # In-process pasteboard write, no pbcopy/xclip subprocess
+            clipboard = QApplication.clipboard()
             if content_type == "image":
-                image = QImage(content)
+                image = load_clipboard_image(self.database, content)
                 if not image.isNull():
                     clipboard.setImage(image)
-                    self.status_label.setText("Image copied to clipboard!")
+                    self._flash_status("Image copied to clipboard!")
                 else:
-                    self.status_label.setText("Error loading image file.")
+                    self._flash_status("Error loading image file.")
             else:
-                pyperclip.copy(content)
-                self.status_label.setText("Copied to clipboard!")
-
-            # Clear status after 2 seconds
-            QTimer.singleShot(2000, lambda: self.status_label.setText("Ready"))
+                clipboard.setText(content)
+                self._flash_status("Copied to clipboard!")
 
         except Exception as e:
-            print(f"Error copying item: {e}")
+            logger.exception("Error copying item")
             self.status_label.setText(f"Error copying: {e}")
 
-    def on_item_double_clicked(self, item):
-        """Handle double click on history item."""
-        # For now, just copy (same as single click)
-        # In a more advanced version, this could paste directly
-        self.on_item_clicked(item)
-
     def toggle_favorite(self):
         """Toggle favorite status of selected item."""
-        current_item = self.history_list.currentItem()
-        if not current_item:
+        current_index = self.history_list.currentIndex()
+        if not current_index.isValid():
             self.status_label.setText("No item selected")
             return
 
+        item_data = current_index.data(Qt.ItemDataRole.UserRole)
+        self.favorite_toggle_requested.emit(item_data["id"])
+
+    def _on_favorite_toggled(self, item_id, success):
+        """Reflect a favorite toggle done by the database worker."""
+        if not success:
+            self.status_label.setText("Error toggling favorite")
+            return
+
         try:
-            item_data = current_item.data(Qt.ItemDataRole.UserRole)
-            item_id = item_data["id"]
-
-            success = self.database.toggle_favorite(item_id)
-            if success:
-                self.refresh_history()
-                self.status_label.setText("Favorite toggled!")
-                QTimer.singleShot(2000, lambda: self.status_label.setText("Ready"))
-            else:
-                self.status_label.setText("Error toggling favorite")
+            self._data_version += 1
+            # Update and move the one row rather than reloading the list
+            position = self.model.find_row(item_id)
+            if position >= 0:
+                position = self.model.set_favorite(
+                    position, not self.model.is_favorite(position)
+                )
+                # A row that sorts past the loaded rows would skip the ones in
+                # between when paging resumes from it; a later page brings it
+                if self._more_rows and position == self.model.rowCount() - 1:
+                    self.model.truncate(position)
+            self._flash_status("Favorite toggled!")
 
         except Exception as e:
-            print(f"Error toggling favorite: {e}")
+            logger.exception("Error toggling favorite")
             self.status_label.setText(f"Error: {e}")
 
     def clear_history(self):
@@ -435,18 +801,23 @@ class ClipNestUI(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                success = self.database.clear_history(keep_favorites=True)
-                if success:
-                    self.refresh_history()
-                    self.status_label.setText("History cleared!")
-                    QTimer.singleShot(2000, lambda: self.status_label.setText("Ready"))
-                else:
-                    self.status_label.setText("Error clearing history")
+            self.clear_requested.emit(True)
 
-            except Exception as e:
-                print(f"Error clearing history: {e}")
-                self.status_label.setText(f"Error: {e}")
+    def _on_history_cleared(self, success):
+        """Reload the list after the database worker cleared history."""
+        if success:
+            self._data_version += 1
+            self.refresh_history()
+            self._flash_status("History cleared!")
+        else:
+            self.status_label.setText("Error clearing history")
+
+    def showEvent(self, event):
+        """Reload items copied while the window was hidden."""
+        super().showEvent(event)
+        if self._history_stale:
+            self._history_stale = False
+            self._do_search()  # Reloads full history when no query is set
 
     def closeEvent(self, event):
         """Handle window close event - hide instead of quit."""